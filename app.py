@@ -1,14 +1,21 @@
+import hashlib
 import io
 import re
 import time
 import random
+import socket
 from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import requests
 import streamlit as st
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pyarrow import csv as pa_csv
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
 from urllib3.util.retry import Retry
 
 
@@ -22,22 +29,48 @@ st.title("⚡ Fast & Reliable URL Checker (CSV upload or CSV URL)")
 # ----------------------------
 # URL + CSV helpers
 # ----------------------------
-def normalize_url(u: str) -> str:
-    if u is None:
-        return ""
-    u = str(u).strip().replace("\r", "")
-    return u
+# any scheme (mailto:, ftp://, ...), but not a bare "host:port"
+_SCHEME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:(?!\d)")
 
-def ensure_scheme(url: str) -> str:
-    if url and not re.match(r"^https?://", url, re.IGNORECASE):
-        return "https://" + url
-    return url
+def normalize_urls(col: pd.Series) -> list[str]:
+    """
+    Strip whitespace/CR and default to https:// for the whole column at once,
+    so workers get ready-to-request URLs. Missing cells become "".
+    URLs that already have a scheme are kept as-is, so is_checkable can reject non-http ones.
+    """
+    urls = col.astype("string").str.replace("\r", "", regex=False).str.strip().fillna("")
+    has_scheme = urls.str.match(_SCHEME_RE) | (urls == "")
+    return urls.where(has_scheme, "https://" + urls).tolist()
+
+def valid_hostname(host: str) -> bool:
+    if ":" in host:  # IPv6 literal
+        return True
+    if len(host.rstrip(".")) > 253:
+        return False
+    try:
+        # same check the resolver does: no empty or over-long labels
+        host.encode("idna")
+    except UnicodeError:
+        return False
+    return True
+
+def is_checkable(u: str) -> bool:
+    # cheap syntax check so broken rows never wait out a connect timeout
+    if not u or " " in u:
+        return False
+    try:
+        p = urlparse(u)
+        return p.scheme in ("http", "https") and bool(p.hostname) and valid_hostname(p.hostname)
+    except ValueError:
+        return False
 
 def infer_url_column(df: pd.DataFrame) -> str | None:
-    for c in ["url", "URL", "link", "Link", "urls", "URLs"]:
-        if c in df.columns:
+    cols = set(df.columns)
+    for c in ("url", "URL", "link", "Link", "urls", "URLs"):
+        if c in cols:
             return c
-    if df.shape[1] == 1:
+    # on huge single-column data, let the user confirm rather than guess
+    if df.shape[1] == 1 and len(df) <= 1_000_000:
         return df.columns[0]
     return None
 
@@ -54,54 +87,229 @@ def to_google_export_url(url: str) -> str | None:
         gid = gid_m.group(1)
     return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
 
+# cached so widget changes don't refetch/reparse the same CSV on every rerun
+@st.cache_data(show_spinner=False, ttl=3600)
 def fetch_text(url: str, timeout: int = 30) -> str:
     r = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
     r.raise_for_status()
     return r.text
 
-def read_csv_flexible(text: str, sep: str = ",", header_mode: str = "infer") -> pd.DataFrame:
+@st.cache_data(show_spinner=False, ttl=3600)
+def read_csv_flexible(data: str | bytes, sep: str = ",", header_mode: str = "infer") -> pd.DataFrame:
+    """
+    Parse with pyarrow's multi-threaded reader; fall back to pandas
+    (skipping bad lines) when the file is malformed.
+    """
+    blob = data.encode("utf-8") if isinstance(data, str) else data
+    try:
+        table = pa_csv.read_csv(
+            pa.BufferReader(blob),
+            read_options=pa_csv.ReadOptions(autogenerate_column_names=(header_mode == "none")),
+            parse_options=pa_csv.ParseOptions(delimiter=sep),
+        )
+        return table.to_pandas()
+    except pa.ArrowInvalid:
+        pass
+
     header = "infer" if header_mode == "infer" else None
     try:
-        return pd.read_csv(io.StringIO(text), sep=sep, header=header)
+        return pd.read_csv(io.BytesIO(blob), sep=sep, header=header)
     except Exception:
         return pd.read_csv(
-            io.StringIO(text),
+            io.BytesIO(blob),
             sep=sep,
             header=header,
             engine="python",
             on_bad_lines="skip",
         )
 
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serialize straight to UTF-8 bytes with pyarrow's writer,
+    without building the whole CSV as a Python str first.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # categorical columns arrive as dictionaries; write them as plain strings
+    table = table.cast(pa.schema([pa.field(f.name, pa.string()) for f in table.schema]))
+    buf = io.BytesIO()
+    pa_csv.write_csv(table, buf)
+    return buf.getvalue()
+
+
+# ----------------------------
+# DNS cache
+# ----------------------------
+# resolve_host result for errors worth another attempt (resolver busy/timed out)
+RETRY_DNS = object()
+
+
+def resolve_host(host: str) -> tuple[str, bool] | object | None:
+    """
+    Return (first IPv4 address, whether the host has other A/AAAA addresses),
+    RETRY_DNS for transient failures, or None when the host doesn't resolve.
+    """
+    try:
+        infos = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    except UnicodeError:
+        # malformed host (empty or over-long label)
+        return None
+    except socket.gaierror as e:
+        # NXDOMAIN and friends won't change on retry; EAI_AGAIN might
+        return RETRY_DNS if e.errno == socket.EAI_AGAIN else None
+    except OSError:
+        return RETRY_DNS
+    ipv4 = [info[4][0] for info in infos if info[0] == socket.AF_INET]
+    if not ipv4:
+        return None
+    return ipv4[0], len({info[4][0] for info in infos}) > 1
+
+def prefetch_dns(hosts: set[str], timeout: float = 3.0, attempts: int = 3) -> dict[str, tuple[str, bool]]:
+    """
+    Resolve every unique host once, in parallel.
+    Each lookup gets `timeout` seconds; transient failures and timeouts are
+    retried up to `attempts` times in total. Hosts that still fail are left
+    out and resolved normally on connect.
+    """
+    dns_cache = {}
+    if not hosts:
+        return dns_cache
+
+    max_workers = min(32, len(hosts))
+    ex = ThreadPoolExecutor(max_workers=max_workers)
+    tries = dict.fromkeys(hosts, 0)
+    started = {}  # future -> when its lookup actually began
+    pending = {}
+    abandoned = []
+
+    def lookup(token, host):
+        started[token] = time.monotonic()
+        return resolve_host(host)
+
+    def submit(host):
+        tries[host] += 1
+        token = object()
+        pending[ex.submit(lookup, token, host)] = (host, token)
+
+    for h in hosts:
+        submit(h)
+
+    while pending:
+        finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+        for fut in finished:
+            host, token = pending.pop(fut)
+            started.pop(token, None)
+            entry = fut.result()
+            if entry is RETRY_DNS:
+                if tries[host] < attempts:
+                    submit(host)
+            elif entry:
+                dns_cache[host] = entry
+
+        now = time.monotonic()
+        for fut, (host, token) in list(pending.items()):
+            t0 = started.get(token)
+            if t0 is not None and now - t0 > timeout:
+                # getaddrinfo can't be cancelled: leave it running and move on
+                del pending[fut]
+                abandoned.append(fut)
+                if tries[host] < attempts:
+                    submit(host)
+
+        # every thread is stuck in a hung lookup: give the rest up to normal resolution
+        if sum(not f.done() for f in abandoned) >= max_workers:
+            break
+
+    ex.shutdown(wait=False, cancel_futures=True)
+    return dns_cache
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """
+    Connects to pre-resolved IPs while keeping the original Host header,
+    SNI and certificate hostname.
+    Only one IPv4 address is cached per host. If it can't be connected to and
+    the host has other addresses, the host is dropped from the cache and the
+    request is retried with normal resolution, so urllib3 can try the other
+    A/AAAA records. Single-address hosts fail straight away: a second full
+    retry cycle against the same address would only double the wait.
+    """
+
+    def __init__(self, dns_cache: dict[str, tuple[str, bool]], **kwargs):
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        host = host_params["host"]
+        entry = self.dns_cache.get(host)
+        if entry:
+            host_params["host"] = entry[0]
+            if host_params["scheme"] == "https":
+                pool_kwargs["server_hostname"] = host
+                pool_kwargs["assert_hostname"] = host
+        return host_params, pool_kwargs
+
+    def send(self, request, **kwargs):
+        try:
+            return super().send(request, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            host = urlparse(request.url).hostname
+            entry = self.dns_cache.get(host)
+            if not isinstance(reason, ConnectTimeoutError) or entry is None or not entry[1]:
+                raise
+            self.dns_cache.pop(host, None)
+        return super().send(request, **kwargs)
+
+    def add_headers(self, request, **kwargs):
+        # recomputed on every hop: redirects copy headers from the previous request
+        parsed = urlparse(request.url)
+        if parsed.hostname in self.dns_cache:
+            request.headers["Host"] = parsed.netloc.rsplit("@", 1)[-1]
+        else:
+            request.headers.pop("Host", None)
+
 
 # ----------------------------
 # HTTP client (pooled + retries)
 # ----------------------------
-def make_session(connect_timeout: int, read_timeout: int, total_retries: int) -> requests.Session:
+def make_session(connect_timeout: int, read_timeout: int, total_retries: int, workers: int,
+                 dns_cache: dict[str, tuple[str, bool]] | None = None) -> requests.Session:
     """
     Create a pooled session with retries for transient errors.
     This improves reliability vs. raw curl in massive parallel.
     """
     s = requests.Session()
 
+    # one shared budget for connect/read/status errors; jitter spreads retries
+    # out so a partial outage isn't hit by every worker at the same instant
     retry = Retry(
         total=total_retries,
-        connect=total_retries,
-        read=total_retries,
-        status=total_retries,
-        backoff_factor=0.4,  # exponential backoff
+        backoff_factor=0.2,  # exponential backoff
+        backoff_jitter=0.5,  # urllib3 >= 2.0
         status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
         allowed_methods=frozenset(["HEAD", "GET"]),
         raise_on_status=False,
     )
 
-    adapter = HTTPAdapter(
+    adapter = CachedDNSAdapter(
+        dns_cache or {},
         max_retries=retry,
         pool_connections=200,
-        pool_maxsize=200,
+        # one keep-alive slot per worker, so busy hosts don't discard connections (and redo TLS)
+        pool_maxsize=workers,
+        # wait for a free pooled connection instead of opening throwaway extras
+        pool_block=True,
     )
     s.mount("http://", adapter)
     s.mount("https://", adapter)
 
+    # bodies are never read, so don't ask for compression
+    s.headers.update({"Accept-Encoding": "identity", "Connection": "keep-alive"})
+    # skip the proxy/netrc environment lookups requests does on every call
+    s.trust_env = False
+
     # store timeouts on session
     s._timeout = (connect_timeout, read_timeout)
     return s
@@ -110,12 +318,78 @@ def make_session(connect_timeout: int, read_timeout: int, total_retries: int) ->
 # ----------------------------
 # URL checker
 # ----------------------------
-def check_one(session: requests.Session, url: str, prefer_get: bool, follow_redirects: bool) -> dict:
-    raw = normalize_url(url)
-    if raw == "":
-        return {"URL": "", "Status Code": "000", "Status": "Empty URL"}
+# Sentinel codes for URLs that never got an HTTP status (all shown as "000")
+CONNECT_FAILED = 0
+INVALID_URL = -1
+EMPTY_URL = -2
+
+# Preformatted labels for known codes, so results don't build new strings per URL
+_CODE_STR = {
+    **{c: str(c) for c in range(100, 600)},
+    CONNECT_FAILED: "000",
+    INVALID_URL: "000",
+    EMPTY_URL: "000",
+}
+_STATUS_MSG = {
+    200: "Working",
+    **{c: f"Not Working (Code: {c})" for c in (301, 302, 400, 401, 403, 404, 405, 410, 429, 500, 502, 503, 504)},
+    # Equivalent of curl's 000: dns failure, timeout, tls handshake, reset, etc.
+    CONNECT_FAILED: "Could not connect (Code: 000)",
+    INVALID_URL: "Invalid URL",
+    EMPTY_URL: "Empty URL",
+}
+
+def code_label(code: int) -> str:
+    return _CODE_STR.get(code) or str(code)
+
+def status_label(code: int) -> str:
+    return _STATUS_MSG.get(code) or f"Not Working (Code: {code})"
+
+def label_codes(codes: np.ndarray, label) -> pd.Categorical:
+    """
+    Turn an array of status codes into a categorical of labels,
+    formatting each distinct code once.
+    """
+    uniq, inv = np.unique(codes, return_inverse=True)
+    labels = [label(int(c)) for c in uniq]
+    categories = list(dict.fromkeys(labels))
+    pos = np.array([categories.index(l) for l in labels], dtype=np.intp)
+    return pd.Categorical.from_codes(pos[inv], categories=categories)
+
+
+# Streamed bodies up to this size are read off so the connection returns to the pool
+MAX_DRAIN_BYTES = 64 * 1024
+
 
-    u = ensure_scheme(raw)
+def release_response(resp: requests.Response) -> None:
+    """
+    Hand the connection back to the pool for reuse when the rest of the body is small;
+    otherwise close it (don’t download full image).
+    """
+    try:
+        length = int(resp.headers.get("Content-Length", ""))
+    except ValueError:
+        length = None
+    try:
+        if length is not None and length <= MAX_DRAIN_BYTES:
+            resp.raw.drain_conn()
+    except Exception:
+        pass
+    finally:
+        # always runs: with pool_block=True a leaked connection stalls the host's workers
+        try:
+            resp.close()
+        except Exception:
+            pass
+
+
+def check_one(session: requests.Session, u: str, prefer_get: bool, follow_redirects: bool,
+              head_blocked: set[str] | None = None) -> int:
+    """
+    Return the HTTP status code for u, or CONNECT_FAILED.
+    Labels are built later for all results at once.
+    Hosts added to head_blocked are sent straight to GET on later calls.
+    """
     headers = {
         "User-Agent": "Mozilla/5.0 (compatible; URLChecker/1.0)",
         "Accept": "*/*",
@@ -123,62 +397,130 @@ def check_one(session: requests.Session, url: str, prefer_get: bool, follow_redi
 
     try:
         # Many CDNs handle GET more consistently than HEAD
-        if prefer_get:
+        host = None if prefer_get or head_blocked is None else urlparse(u).hostname
+        if prefer_get or (host is not None and host in head_blocked):
             resp = session.get(u, headers=headers, allow_redirects=follow_redirects, timeout=session._timeout, stream=True)
         else:
             resp = session.head(u, headers=headers, allow_redirects=follow_redirects, timeout=session._timeout)
             # fallback if server blocks HEAD
             if resp.status_code in (403, 405):
+                if host is not None:
+                    # set.add is atomic under the GIL; a racing duplicate HEAD is harmless
+                    head_blocked.add(host)
                 resp = session.get(u, headers=headers, allow_redirects=follow_redirects, timeout=session._timeout, stream=True)
 
         code = resp.status_code
-
-        # close streaming response quickly (don’t download full image)
-        try:
-            resp.close()
-        except Exception:
-            pass
-
-        if code == 200:
-            msg = "Working"
-        else:
-            msg = f"Not Working (Code: {code})"
-
-        return {"URL": u, "Status Code": str(code), "Status": msg}
+        release_response(resp)
+        return code
 
     except requests.exceptions.RequestException:
-        # Equivalent of curl's 000: dns failure, timeout, tls handshake, reset, etc.
-        return {"URL": u, "Status Code": "000", "Status": "Could not connect (Code: 000)"}
-
-
-def run_checks(urls: list[str], workers: int, connect_timeout: int, read_timeout: int, retries: int,
-               prefer_get: bool, follow_redirects: bool) -> pd.DataFrame:
-    session = make_session(connect_timeout, read_timeout, retries)
-
-    results = [None] * len(urls)
+        return CONNECT_FAILED
+
+
+def _hash_url_list(urls: list[str]) -> bytes:
+    # one digest for the whole list instead of Streamlit hashing every element;
+    # length-prefixed, since URLs from quoted CSV cells may contain any separator
+    h = hashlib.blake2b(digest_size=16)
+    h.update(len(urls).to_bytes(8, "little"))
+    for u in urls:
+        b = u.encode("utf-8")
+        h.update(len(b).to_bytes(8, "little"))
+        h.update(b)
+    return h.digest()
+
+
+# short ttl: re-running later should re-check links, not replay an old scan
+@st.cache_data(show_spinner=False, max_entries=8, ttl=600, hash_funcs={list: _hash_url_list})
+def run_checks(urls: list[str], workers: int, per_host: int, connect_timeout: int, read_timeout: int,
+               retries: int, prefer_get: bool, follow_redirects: bool) -> pd.DataFrame:
+    # urls come from normalize_urls.
+    # check each distinct URL once, then scatter results back to every row
+    unique_pos = {}
+    inverse = [unique_pos.setdefault(u, len(unique_pos)) for u in urls]
+    unique = list(unique_pos)
+
+    # raw status code per unique URL, filled by index
+    codes = np.empty(len(unique), dtype=np.int16)
+
+    # empty/invalid URLs are answered up front and never reach the pool
+    todo = []
+    for i, u in enumerate(unique):
+        if is_checkable(u):
+            todo.append(i)
+        else:
+            codes[i] = INVALID_URL if u else EMPTY_URL
+
+    # rotate submissions across hosts so one big host doesn't starve the rest,
+    # and never run more than per_host requests against one host at a time
+    queues = defaultdict(deque)
+    for i in todo:
+        queues[urlparse(unique[i]).hostname].append(i)
+    ready = deque(queues)  # hosts with URLs left and a free slot, in turn order
+    in_flight = dict.fromkeys(queues, 0)
+    # hosts seen rejecting HEAD during this run
+    head_blocked = set()
+
+    prog = st.progress(0)
+    status = st.empty()
+
+    if queues:
+        status.write(f"Resolving {len(queues)} hosts…")
+    dns_cache = prefetch_dns(set(queues))
+    session = make_session(connect_timeout, read_timeout, retries, workers, dns_cache)
+
+    done = 0
+    total = len(todo)
+
+    last_pct = 0
+
+    def collect(finished):
+        nonlocal done, last_pct
+        for fut in finished:
+            i, host = pending.pop(fut)
+            codes[i] = fut.result()
+            in_flight[host] -= 1
+            # host just dropped below its cap: give it a turn again
+            if queues[host] and in_flight[host] == per_host - 1:
+                ready.append(host)
+            done += 1
+            # redraw only when the percentage moves: st.cache_data records every call for replay
+            pct = int(done * 100 / total)
+            if pct != last_pct or done == total:
+                last_pct = pct
+                prog.progress(pct)
+                status.write(f"Checked {done}/{total} unique valid URLs ({len(urls)} rows)")
 
     # IMPORTANT: massive workers can create 000s. Bounded concurrency is “reliable fast”.
+    # Only keep 2x workers futures alive, so memory doesn't grow with the URL count.
+    # Only hosts below their cap are submitted, so no worker thread sits waiting on a host.
+    window = 2 * workers
+    pending = {}
     with ThreadPoolExecutor(max_workers=workers) as ex:
-        future_map = {
-            ex.submit(check_one, session, urls[i], prefer_get, follow_redirects): i
-            for i in range(len(urls))
-        }
-
-        done = 0
-        total = len(urls)
-        prog = st.progress(0)
-        status = st.empty()
-
-        for fut in as_completed(future_map):
-            i = future_map[fut]
-            results[i] = fut.result()
-            done += 1
-            if total:
-                prog.progress(int(done * 100 / total))
-            if done % 25 == 0 or done == total:
-                status.write(f"Checked {done}/{total}")
-
-    return pd.DataFrame(results)
+        while ready or pending:
+            while ready and len(pending) < window:
+                host = ready.popleft()
+                i = queues[host].popleft()
+                fut = ex.submit(check_one, session, unique[i], prefer_get, follow_redirects, head_blocked)
+                pending[fut] = (i, host)
+                in_flight[host] += 1
+                if queues[host] and in_flight[host] < per_host:
+                    ready.append(host)
+
+            if pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+    rows = np.asarray(inverse, dtype=np.intp)
+    row_codes = codes[rows]
+    # status columns have only a handful of distinct values
+    return pd.DataFrame(
+        {
+            "URL": np.array(unique, dtype=object)[rows],
+            "Status Code": label_codes(row_codes, code_label),
+            "Status": label_codes(row_codes, status_label),
+        },
+        copy=False,
+    )
 
 
 # ----------------------------
@@ -188,20 +530,22 @@ st.subheader("1) Load URLs")
 
 mode = st.radio("Input method", ["Upload CSV", "CSV via URL"], horizontal=True)
 
-c1, c2, c3, c4 = st.columns(4)
+c1, c2, c3, c4, c5 = st.columns(5)
 with c1:
     workers = st.slider("Workers (parallel)", 1, 300, 80, 1)
 with c2:
-    connect_timeout = st.slider("Connect timeout (s)", 1, 20, 5, 1)
+    per_host = st.slider("Max parallel per host (300 = no cap)", 1, 300, 300, 1)
 with c3:
-    read_timeout = st.slider("Read timeout (s)", 1, 30, 10, 1)
+    connect_timeout = st.slider("Connect timeout (s)", 1, 20, 5, 1)
 with c4:
+    read_timeout = st.slider("Read timeout (s)", 1, 30, 10, 1)
+with c5:
     retries = st.slider("Retries (for 000/429/5xx)", 0, 5, 2, 1)
 
-c5, c6 = st.columns(2)
-with c5:
-    prefer_get = st.checkbox("Prefer GET (more reliable for CDNs/images)", value=True)
+c6, c7 = st.columns(2)
 with c6:
+    prefer_get = st.checkbox("Prefer GET (more reliable for CDNs/images)", value=True)
+with c7:
     follow_redirects = st.checkbox("Follow redirects", value=True)
 
 sep = st.selectbox("CSV delimiter", options=[",", "\t", ";", "|"], index=0)
@@ -212,9 +556,12 @@ df = None
 if mode == "Upload CSV":
     up = st.file_uploader("Upload CSV", type=["csv"])
     if up is not None:
-        df = pd.read_csv(up)
+        df = read_csv_flexible(up.getvalue(), sep=sep, header_mode=header_mode)
 else:
     csv_url = st.text_input("Paste CSV URL (Google Sheets supported)")
+    # fetched CSVs are cached for an hour; this picks up edits to the sheet
+    if st.button("Reload CSV 🔄", disabled=not csv_url):
+        fetch_text.clear()
     if csv_url:
         export_url = to_google_export_url(csv_url)
         effective_url = export_url or csv_url
@@ -242,13 +589,17 @@ if df is not None:
     else:
         st.info(f"Detected URL column: **{url_col}**")
 
-    urls = [normalize_url(x) for x in df[url_col].tolist()]
+    urls = normalize_urls(df[url_col])
 
     st.subheader("3) Run checks")
+    recheck = st.checkbox("Force re-check (ignore results cached in the last 10 min)", value=False)
     if st.button("Run URL Check ⚡", type="primary"):
+        if recheck:
+            run_checks.clear()
         results_df = run_checks(
             urls=urls,
             workers=workers,
+            per_host=per_host,
             connect_timeout=connect_timeout,
             read_timeout=read_timeout,
             retries=retries,
@@ -265,5 +616,5 @@ if df is not None:
         st.write(f"✅ Working (200): **{ok}**  |  ❌ Not 200 / 000: **{not_ok}**")
 
         # Download
-        out = results_df.to_csv(index=False).encode("utf-8")
+        out = to_csv_bytes(results_df)
         st.download_button("⬇️ Download results.csv", data=out, file_name="results.csv", mime="text/csv")